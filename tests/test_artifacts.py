@@ -0,0 +1,99 @@
+import base64, os
+
+import pytest
+
+from vibetest.artifacts import ArtifactStore
+
+
+def _shot(size: int = 512) -> str:
+    return base64.b64encode(os.urandom(size)).decode("ascii")
+
+
+def _object_count(store: ArtifactStore) -> int:
+    return sum(len(files) for _, _, files in os.walk(os.path.join(store.root, "objects")))
+
+
+def test_screenshots_deduplicated_across_agents_and_runs(tmp_path):
+    store = ArtifactStore(str(tmp_path), max_runs=10, max_bytes=10**9)
+    shot = _shot()
+
+    for test_id in ("run-a", "run-b"):
+        manifests = {
+            agent_id: store.save_agent(test_id, agent_id, [{"step": 0}], [], [shot, None, shot])
+            for agent_id in range(2)
+        }
+        store.commit_run(test_id, manifests)
+
+    loaded = store.load_agent(store.load_run("run-b")["agents"]["1"], include_screenshots=True)
+    assert loaded["screenshots"] == [shot, shot]
+    # one screenshot, one trace, one error log, four manifests
+    assert _object_count(store) == 7
+
+
+def test_eviction_by_run_count(tmp_path):
+    store = ArtifactStore(str(tmp_path), max_runs=2, max_bytes=10**9)
+    for test_id in ("run-a", "run-b", "run-c"):
+        store.commit_run(test_id, {0: store.save_agent(test_id, 0, [], [], [_shot()])})
+
+    assert store.load_run("run-a") is None
+    assert store.load_run("run-b") is not None
+    assert store.load_run("run-c") is not None
+    # run-a's screenshot and manifest are gone; the empty trace/errors blob is shared
+    assert _object_count(store) == 2 * 2 + 1
+
+
+def test_eviction_by_bytes_keeps_committed_run(tmp_path):
+    store = ArtifactStore(str(tmp_path), max_runs=10, max_bytes=100)
+    first = store.save_agent("run-a", 0, [], [], [_shot(5000)])
+    store.commit_run("run-a", {0: first})
+
+    # a single run over the cap survives its own commit
+    assert store.load_agent(first)["screenshots"]
+
+    second = store.save_agent("run-b", 0, [], [], [_shot(5000)])
+    store.commit_run("run-b", {0: second})
+
+    assert store.load_run("run-a") is None
+    with pytest.raises(FileNotFoundError):
+        store.load_agent(first)
+    assert store.load_agent(second)["screenshots"]
+
+
+def test_released_run_does_not_evict_committed_runs(tmp_path):
+    store = ArtifactStore(str(tmp_path), max_runs=10, max_bytes=20 * 1024)
+    for test_id in ("run-a", "run-b"):
+        store.commit_run(test_id, {0: store.save_agent(test_id, 0, [], [], [_shot(2048)])})
+
+    orphan = store.put(os.urandom(30 * 1024), "run-x")
+    store.release_run("run-x")
+    store.commit_run("run-c", {0: store.save_agent("run-c", 0, [], [], [_shot(2048)])})
+
+    for test_id in ("run-a", "run-b", "run-c"):
+        assert store.load_run(test_id) is not None
+    with pytest.raises(FileNotFoundError):
+        store.get(orphan)
+
+
+def test_uncommitted_agent_blobs_do_not_count_toward_cap(tmp_path):
+    store = ArtifactStore(str(tmp_path), max_runs=10, max_bytes=20 * 1024)
+    store.commit_run("run-a", {0: store.save_agent("run-a", 0, [], [], [_shot(2048)])})
+
+    # agent 1 of run-b stored evidence but is left out of the commit
+    store.save_agent("run-b", 1, [], [], [_shot(30 * 1024)])
+    store.commit_run("run-b", {0: store.save_agent("run-b", 0, [], [], [_shot(2048)])})
+
+    assert store.load_run("run-a") is not None
+    assert store.load_run("run-b") is not None
+    assert _object_count(store) == 2 * 2 + 1
+
+
+@pytest.mark.parametrize("digest", ["../tmp/secret", "/etc/passwd", "ab", "A" * 64, "0" * 63 + "/"])
+def test_invalid_digest_rejected(tmp_path, digest):
+    store = ArtifactStore(str(tmp_path))
+    with pytest.raises(ValueError):
+        store.get(digest)
+
+
+def test_invalid_test_id_rejected(tmp_path):
+    store = ArtifactStore(str(tmp_path))
+    assert store.load_run("../secret") is None
@@ -0,0 +1,43 @@
+import asyncio, importlib, logging, sys, types
+
+import pytest
+
+pytest.importorskip("mcp")
+
+
+@pytest.fixture
+def mcp_server(monkeypatch, tmp_path):
+    # the real agents module needs browser-use and an API key
+    agents = types.ModuleType("vibetest.agents")
+    agents.run_pool = None
+    agents.summarize_bug_reports = None
+    agents._test_results = {}
+    monkeypatch.setitem(sys.modules, "vibetest.agents", agents)
+    monkeypatch.delitem(sys.modules, "vibetest.mcp_server", raising=False)
+
+    # importing the server silences stderr and logging; undo that for pytest
+    stderr = sys.stderr
+    try:
+        module = importlib.import_module("vibetest.mcp_server")
+    finally:
+        sys.stderr = stderr
+        logging.disable(logging.NOTSET)
+
+    from vibetest.artifacts import ArtifactStore
+    monkeypatch.setattr(module, "get_store", lambda: ArtifactStore(str(tmp_path)))
+    yield module
+    sys.modules.pop("vibetest.mcp_server", None)
+
+
+def test_tools_register(mcp_server):
+    tools = asyncio.run(mcp_server.mcp.list_tools())
+    assert {tool.name for tool in tools} == {"start", "results", "artifacts", "screenshot"}
+
+
+def test_screenshot_errors_are_reported(mcp_server):
+    assert "error" in mcp_server.screenshot("../tmp/secret")
+    assert "error" in mcp_server.screenshot("0" * 64)
+
+
+def test_artifacts_unknown_test(mcp_server):
+    assert "not found" in mcp_server.artifacts("missing", 0)["error"]
@@ -1,6 +1,7 @@
 import asyncio, os, uuid, json, time
 from browser_use import Agent, BrowserSession, BrowserProfile
 from langchain_openai import ChatOpenAI
+from .artifacts import get_store, MAX_RUNS
 
 # OpenAI-compatible API configuration
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
@@ -22,6 +23,79 @@ def get_screen_dimensions():
     except Exception:
         return 1920, 1080
 
+def attach_error_listeners(page, errors: list):
+    """Record console errors, uncaught exceptions and failed requests of a page"""
+    def on_console(msg):
+        if msg.type == "error":
+            errors.append({"type": "console", "text": msg.text, "url": page.url, "timestamp": time.time()})
+
+    def on_response(response):
+        if response.status >= 400:
+            errors.append({"type": "network", "status": response.status, "url": response.url, "timestamp": time.time()})
+
+    page.on("console", on_console)
+    page.on("pageerror", lambda exc: errors.append({"type": "pageerror", "text": str(exc), "url": page.url, "timestamp": time.time()}))
+    page.on("requestfailed", lambda request: errors.append({"type": "network", "text": str(request.failure), "url": request.url, "timestamp": time.time()}))
+    page.on("response", on_response)
+
+def extract_trace(history) -> tuple:
+    """Split an agent history into a JSON-able step trace and its base64 screenshots"""
+    trace = []
+    screenshots = []
+    for step, item in enumerate(getattr(history, 'history', [])):
+        state = getattr(item, 'state', None)
+        model_output = getattr(item, 'model_output', None)
+
+        # model reasoning: older browser-use nests it under current_state
+        brain = getattr(model_output, 'current_state', model_output)
+        reasoning = {
+            "evaluation_previous_goal": getattr(brain, 'evaluation_previous_goal', None),
+            "memory": getattr(brain, 'memory', None),
+            "next_goal": getattr(brain, 'next_goal', None),
+        }
+
+        actions = []
+        if model_output is not None:
+            for action in getattr(model_output, 'action', []):
+                try:
+                    actions.append(action.model_dump(exclude_none=True))
+                except Exception:
+                    actions.append(str(action))
+
+        trace.append({
+            "step": step,
+            "url": getattr(state, 'url', None),
+            "title": getattr(state, 'title', None),
+            "reasoning": reasoning,
+            "actions": actions,
+            "results": [
+                {
+                    "extracted_content": getattr(r, 'extracted_content', None),
+                    "error": getattr(r, 'error', None),
+                    "is_done": getattr(r, 'is_done', None),
+                }
+                for r in getattr(item, 'result', []) or []
+            ],
+        })
+
+        screenshot = getattr(state, 'screenshot', None)
+        if screenshot is None and hasattr(state, 'get_screenshot'):
+            try:
+                screenshot = state.get_screenshot()
+            except Exception:
+                screenshot = None
+        screenshots.append(screenshot)
+
+    return trace, screenshots
+
+def save_artifacts(test_id: str, agent_id: int, history, errors: list):
+    """Persist an agent's evidence; returns the manifest digest or None if storing failed"""
+    try:
+        trace, screenshots = extract_trace(history) if history is not None else ([], [])
+        return get_store().save_agent(test_id, agent_id, trace, errors, screenshots)
+    except Exception:
+        return None
+
 async def run_pool(base_url: str, num_agents: int = 3, headless: bool = False) -> str:
     test_id = str(uuid.uuid4())
     start_time = time.time()
@@ -37,6 +111,9 @@ async def run_pool(base_url: str, num_agents: int = 3, headless: bool = False) -
 
     async def run_single_agent(i: int):
         task_description = qa_tasks[i % len(qa_tasks)]
+        page_errors = []
+        history = None
+        agent = None
         
         try:
             # browser configuration
@@ -123,7 +200,33 @@ async def run_pool(base_url: str, num_agents: int = 3, headless: bool = False) -
                 use_vision=True
             )
             
-            history = await agent.run()
+            # capture console/network errors from every page the agent visits
+            watched_pages = set()
+
+            watched_contexts = set()
+            
+            def watch(page):
+                if id(page) not in watched_pages:
+                    watched_pages.add(id(page))
+                    attach_error_listeners(page, page_errors)
+            
+            async def watch_page(agent):
+                try:
+                    # tabs opened mid-step are picked up as soon as they are created
+                    context = getattr(agent.browser_session, 'browser_context', None)
+                    if context is not None and id(context) not in watched_contexts:
+                        watched_contexts.add(id(context))
+                        context.on("page", watch)
+                        for page in context.pages:
+                            watch(page)
+                    
+                    page = await agent.browser_session.get_current_page()
+                    if page is not None:
+                        watch(page)
+                except Exception:
+                    pass
+            
+            history = await agent.run(on_step_start=watch_page)
             await browser_session.close()
             
             result_text = str(history.final_result()) if hasattr(history, 'final_result') else str(history)
@@ -132,6 +235,7 @@ async def run_pool(base_url: str, num_agents: int = 3, headless: bool = False) -
                 "agent_id": i,
                 "task": task_description,
                 "result": result_text,
+                "artifacts": await asyncio.to_thread(save_artifacts, test_id, i, history, list(page_errors)),
                 "timestamp": time.time(),
                 "status": "success"
             }
@@ -142,11 +246,16 @@ async def run_pool(base_url: str, num_agents: int = 3, headless: bool = False) -
                     await browser_session.close()
             except:
                 pass
+            
+            # keep the partial trace of a failed run
+            if history is None and agent is not None:
+                history = getattr(getattr(agent, 'state', None), 'history', None)
                 
             return {
                 "agent_id": i,
                 "task": task_description,
                 "error": str(e),
+                "artifacts": await asyncio.to_thread(save_artifacts, test_id, i, history, list(page_errors)),
                 "timestamp": time.time(),
                 "status": "error"
             }
@@ -165,6 +274,16 @@ async def run_pool(base_url: str, num_agents: int = 3, headless: bool = False) -
     
     end_time = time.time()
     
+    # index stored evidence; this also applies the retention cap
+    try:
+        await asyncio.to_thread(get_store().commit_run, test_id, {
+            r["agent_id"]: r["artifacts"]
+            for r in results
+            if not isinstance(r, Exception) and r.get("artifacts")
+        })
+    except Exception:
+        get_store().release_run(test_id)
+    
     # cleanup lingering browser processes
     try:
         import subprocess
@@ -189,6 +308,10 @@ async def run_pool(base_url: str, num_agents: int = 3, headless: bool = False) -
     
     _test_results[test_id] = test_data
     
+    # keep in-memory results bounded like the on-disk store
+    while len(_test_results) > MAX_RUNS:
+        _test_results.pop(next(iter(_test_results)))
+    
     return test_id
 
 
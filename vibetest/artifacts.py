@@ -0,0 +1,309 @@
+"""Content-addressed on-disk store for agent evidence (traces, screenshots, errors).
+
+Layout under the store root:
+
+    objects/<aa>/<rest of sha256>   zlib-compressed blobs, keyed by the sha256 of the raw bytes
+    runs/<test_id>.json             run index: agent manifests plus every blob the run references
+
+Every agent gets a JSON manifest (itself a blob) that references its trace,
+error log and screenshots by digest, so identical screenshots are written once
+no matter how many agents or runs produced them. Results only carry the
+manifest digest; the heavy data is read back on demand.
+"""
+
+import base64, hashlib, json, os, re, threading, time, zlib
+
+def _env_int(name: str, default: int, minimum: int) -> int:
+    """Read an integer setting, falling back to the default on garbage values"""
+    try:
+        return max(minimum, int(os.getenv(name, default)))
+    except ValueError:
+        return default
+
+ARTIFACT_DIR = os.getenv("VIBETEST_ARTIFACT_DIR", os.path.join(os.path.expanduser("~"), ".vibetest", "artifacts"))
+MAX_RUNS = _env_int("VIBETEST_MAX_RUNS", 50, 1)
+MAX_BYTES = _env_int("VIBETEST_MAX_ARTIFACT_MB", 1024, 0) * 1024 * 1024
+
+# leftover temp files older than this are from crashed writers
+STALE_TMP_SECONDS = 3600
+
+_DIGEST_RE = re.compile(r"[0-9a-f]{64}")
+_TEST_ID_RE = re.compile(r"[0-9A-Za-z_-]+")
+
+
+class ArtifactStore:
+    def __init__(self, root: str = ARTIFACT_DIR, max_runs: int = MAX_RUNS, max_bytes: int = MAX_BYTES):
+        self.root = root
+        self.max_runs = max(1, max_runs)
+        self.max_bytes = max_bytes
+        self._objects = os.path.join(root, "objects")
+        self._runs = os.path.join(root, "runs")
+        # digests written by runs that have not been committed yet; never swept
+        self._pinned = {}
+        self._lock = threading.Lock()
+        # serialises retention passes without blocking put()
+        self._prune_lock = threading.Lock()
+        self._run_cache = {}
+        self._last_collect = 0.0
+
+    # --- blobs ---
+
+    def _object_path(self, digest: str) -> str:
+        if not isinstance(digest, str) or not _DIGEST_RE.fullmatch(digest):
+            raise ValueError(f"Invalid artifact digest: {digest!r}")
+        return os.path.join(self._objects, digest[:2], digest[2:])
+
+    def _run_path(self, test_id: str) -> str:
+        if not isinstance(test_id, str) or not _TEST_ID_RE.fullmatch(test_id):
+            raise ValueError(f"Invalid test ID: {test_id!r}")
+        return os.path.join(self._runs, f"{test_id}.json")
+
+    def put(self, data: bytes, test_id: str = None, level: int = 6) -> str:
+        """Store raw bytes and return their sha256 digest. Existing blobs are reused."""
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._object_path(digest)
+
+        with self._lock:
+            if test_id is not None:
+                self._pinned.setdefault(test_id, set()).add(digest)
+            if os.path.exists(path):
+                # refresh mtime so other processes' prunes treat it as in use
+                try:
+                    os.utime(path)
+                    return digest
+                except OSError:
+                    pass
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(zlib.compress(data, level))
+        os.replace(tmp_path, path)
+        return digest
+
+    def get(self, digest: str) -> bytes:
+        """Load and decompress a blob by digest."""
+        with open(self._object_path(digest), "rb") as f:
+            return zlib.decompress(f.read())
+
+    def put_json(self, obj, test_id: str = None) -> str:
+        return self.put(json.dumps(obj, sort_keys=True, default=str).encode("utf-8"), test_id)
+
+    def get_json(self, digest: str):
+        return json.loads(self.get(digest).decode("utf-8"))
+
+    # --- agent evidence ---
+
+    def save_agent(self, test_id: str, agent_id: int, trace: list, errors: list, screenshots: list) -> str:
+        """Store one agent's evidence and return the digest of its manifest.
+
+        `screenshots` are base64-encoded images as produced by browser-use; empty
+        entries are skipped. Images are already compressed, so they only get the
+        cheapest zlib level.
+        """
+        screenshot_digests = []
+        for shot in screenshots:
+            if not shot:
+                continue
+            try:
+                data = base64.b64decode(shot)
+            except Exception:
+                continue
+            screenshot_digests.append(self.put(data, test_id, level=1))
+
+        manifest = {
+            "test_id": test_id,
+            "agent_id": agent_id,
+            "trace": self.put_json(trace, test_id),
+            "errors": self.put_json(errors, test_id),
+            "screenshots": screenshot_digests,
+        }
+        return self.put_json(manifest, test_id)
+
+    def load_agent(self, manifest_digest: str, include_screenshots: bool = False) -> dict:
+        """Resolve a manifest into its trace and errors.
+
+        Screenshots stay as digests unless `include_screenshots` is set, in which
+        case they are returned base64-encoded. Raises FileNotFoundError once the
+        evidence has been evicted.
+        """
+        manifest = self.get_json(manifest_digest)
+        loaded = {
+            "test_id": manifest["test_id"],
+            "agent_id": manifest["agent_id"],
+            "trace": self.get_json(manifest["trace"]),
+            "errors": self.get_json(manifest["errors"]),
+            "screenshots": manifest["screenshots"],
+        }
+        if include_screenshots:
+            loaded["screenshots"] = [
+                base64.b64encode(self.get(digest)).decode("ascii") for digest in manifest["screenshots"]
+            ]
+        return loaded
+
+    # --- runs & retention ---
+
+    def _run_blobs(self, manifests: dict) -> dict:
+        """Map every blob a run references to its on-disk size."""
+        blobs = {}
+        for manifest_digest in manifests.values():
+            digests = [manifest_digest]
+            try:
+                manifest = self.get_json(manifest_digest)
+                digests += [manifest["trace"], manifest["errors"], *manifest["screenshots"]]
+            except Exception:
+                pass
+            for digest in digests:
+                try:
+                    blobs[digest] = os.path.getsize(self._object_path(digest))
+                except OSError:
+                    pass
+        return blobs
+
+    def commit_run(self, test_id: str, manifests: dict) -> None:
+        """Record the agent manifests of a finished run and apply the retention cap."""
+        path = self._run_path(test_id)
+        os.makedirs(self._runs, exist_ok=True)
+        blobs = self._run_blobs(manifests)
+        index = {
+            "test_id": test_id,
+            "created": time.time(),
+            "agents": {str(agent_id): digest for agent_id, digest in manifests.items()},
+            "blobs": blobs,
+        }
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(index, f)
+        os.replace(tmp_path, path)
+
+        with self._lock:
+            pinned = self._pinned.pop(test_id, set())
+
+        # blobs written for agents that never made it into a manifest
+        self.prune(keep=test_id, orphans=pinned - blobs.keys())
+
+    def release_run(self, test_id: str) -> None:
+        """Drop a run that will never be committed, deleting the blobs only it wrote."""
+        with self._lock:
+            pinned = self._pinned.pop(test_id, set())
+        self.prune(orphans=pinned)
+
+    def load_run(self, test_id: str):
+        """Return the on-disk index of a committed run, or None if it is unknown or evicted."""
+        try:
+            with open(self._run_path(test_id)) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _list_runs(self) -> list:
+        """Committed run indexes, oldest first. Indexes are immutable, so each is read once."""
+        if not os.path.isdir(self._runs):
+            return []
+        names = {name for name in os.listdir(self._runs) if name.endswith(".json")}
+        for name in self._run_cache.keys() - names:
+            del self._run_cache[name]
+        for name in names - self._run_cache.keys():
+            try:
+                with open(os.path.join(self._runs, name)) as f:
+                    self._run_cache[name] = json.load(f)
+            except Exception:
+                continue
+        return sorted(self._run_cache.values(), key=lambda run: run.get("created", 0))
+
+    def prune(self, keep: str = None, orphans=()) -> None:
+        """Evict the oldest runs until both the run count and byte caps hold.
+
+        Only blobs referenced by committed runs count toward the byte cap. The
+        run named by `keep` is never evicted, even if it alone exceeds the cap.
+        `orphans` are blobs this process wrote that no run references.
+        """
+        with self._prune_lock:
+            self._prune(keep, orphans)
+
+    def _prune(self, keep: str, orphans) -> None:
+        started = time.time()
+        runs = self._list_runs()
+
+        refs = {}
+        sizes = {}
+        for run in runs:
+            for digest, size in run.get("blobs", {}).items():
+                refs[digest] = refs.get(digest, 0) + 1
+                sizes[digest] = size
+        total = sum(sizes.values())
+
+        candidates = {}
+        remaining = len(runs)
+        evictable = [run for run in runs if run.get("test_id") != keep]
+        while evictable and (remaining > self.max_runs or total > self.max_bytes):
+            victim = evictable.pop(0)
+            self._drop_run(victim)
+            remaining -= 1
+            for digest in victim.get("blobs", {}):
+                refs[digest] -= 1
+                if refs[digest] == 0:
+                    del refs[digest]
+                    total -= sizes[digest]
+                    # a later touch means another writer reused the blob
+                    candidates[digest] = victim.get("created", 0)
+
+        for digest in orphans:
+            if digest not in refs:
+                candidates[digest] = started
+
+        for digest, since in candidates.items():
+            self._discard(digest, since)
+
+        if started - self._last_collect >= STALE_TMP_SECONDS:
+            self._last_collect = started
+            self._collect_garbage(refs.keys(), started)
+
+    def _discard(self, digest: str, since: float) -> None:
+        """Delete a blob unless a pending run pinned it or it was touched after `since`."""
+        path = self._object_path(digest)
+        with self._lock:
+            if any(digest in digests for digests in self._pinned.values()):
+                return
+            try:
+                if os.stat(path).st_mtime <= since:
+                    os.remove(path)
+            except OSError:
+                pass
+
+    def _collect_garbage(self, live, now: float) -> None:
+        """Walk the object store for blobs no run references (e.g. left by a crashed process).
+
+        Anything touched within STALE_TMP_SECONDS may still belong to another
+        process's uncommitted run and is left alone.
+        """
+        if not os.path.isdir(self._objects):
+            return
+        for prefix in os.listdir(self._objects):
+            prefix_dir = os.path.join(self._objects, prefix)
+            for name in os.listdir(prefix_dir):
+                path = os.path.join(prefix_dir, name)
+                try:
+                    if os.stat(path).st_mtime >= now - STALE_TMP_SECONDS:
+                        continue
+                    if name.endswith(".tmp"):
+                        os.remove(path)
+                    elif prefix + name not in live:
+                        self._discard(prefix + name, now - STALE_TMP_SECONDS)
+                except (OSError, ValueError):
+                    pass
+
+    def _drop_run(self, run: dict) -> None:
+        try:
+            os.remove(self._run_path(run["test_id"]))
+        except (OSError, ValueError, KeyError):
+            pass
+
+_store = None
+
+def get_store() -> ArtifactStore:
+    """Shared store instance, created lazily on first use"""
+    global _store
+    if _store is None:
+        _store = ArtifactStore()
+    return _store
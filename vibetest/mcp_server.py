@@ -12,8 +12,9 @@ os.environ['BROWSER_USE_LOGGING_LEVEL'] = 'CRITICAL'
 if hasattr(sys.stderr, 'close'):
     sys.stderr = open(os.devnull, 'w')
 
-from mcp.server.fastmcp import FastMCP
+from mcp.server.fastmcp import FastMCP, Image
 from .agents import run_pool, summarize_bug_reports
+from .artifacts import get_store
 
 # Create FastMCP instance
 mcp = FastMCP("vibetest")
@@ -74,6 +75,60 @@ def results(test_id: str) -> dict:
     except Exception as e:
         return {"error": f"Error getting results: {str(e)}"}
 
+@mcp.tool()
+def artifacts(test_id: str, agent_id: int) -> dict:
+    """Get the stored step trace and console/network errors of one agent.
+    
+    Args:
+        test_id: The test ID returned from start
+        agent_id: The agent whose evidence to load
+    
+    Returns:
+        dict: Step trace, captured errors and screenshot digests (fetch them with screenshot)
+    """
+    try:
+        from .agents import _test_results
+        test_data = _test_results.get(test_id)
+        
+        # fall back to the on-disk index for runs no longer held in memory
+        if test_data is not None:
+            manifests = {r["agent_id"]: r.get("artifacts") for r in test_data["results"]}
+        else:
+            run_index = get_store().load_run(test_id)
+            if run_index is None:
+                return {"error": f"Test ID {test_id} not found"}
+            manifests = {int(a): digest for a, digest in run_index["agents"].items()}
+        
+        if agent_id not in manifests:
+            return {"error": f"Agent {agent_id} not found in test {test_id}"}
+        if not manifests[agent_id]:
+            return {"error": f"No artifacts stored for agent {agent_id}"}
+        
+        try:
+            return get_store().load_agent(manifests[agent_id])
+        except FileNotFoundError:
+            return {"error": f"Evidence for agent {agent_id} in test {test_id} was evicted"}
+        
+    except Exception as e:
+        return {"error": f"Error loading artifacts: {str(e)}"}
+
+@mcp.tool()
+def screenshot(digest: str):
+    """Get a screenshot captured by an agent.
+    
+    Args:
+        digest: A screenshot digest listed by artifacts
+    
+    Returns:
+        Image: The PNG screenshot
+    """
+    try:
+        return Image(data=get_store().get(digest), format="png")
+    except FileNotFoundError:
+        return {"error": f"Screenshot {digest} not found or evicted"}
+    except Exception as e:
+        return {"error": f"Error loading screenshot: {str(e)}"}
+
 def run():
     """Entry point for the MCP server"""
     try: